@@ -1,15 +1,228 @@
+import heapq
 import numpy as np
 import os
+from pathlib import Path
 import geopandas as gpd
 import gurobipy as gp
-from shapely.geometry import Point, LineString
+import scipy.sparse as sp
+from scipy.spatial import cKDTree
+import shapely
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, fall back to the NumPy edge builder
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _build_edges_numba(pts, d_root):
+        n = pts.shape[0]
+
+        # First pass: count kept edges per row
+        counts = np.zeros(n, dtype=np.int64)
+        for i in prange(n):
+            c = 0
+            for j in range(i + 1, n):
+                dx = pts[i, 0] - pts[j, 0]
+                dy = pts[i, 1] - pts[j, 1]
+                w = np.sqrt(dx * dx + dy * dy)
+                if i == 0 or w <= max(d_root[i], d_root[j]):
+                    c += 1
+            counts[i] = c
+
+        # Prefix-sum row offsets into the output arrays
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        for i in range(n):
+            offsets[i + 1] = offsets[i] + counts[i]
+
+        # Second pass: fill preallocated (i, j, w) arrays
+        m = offsets[n]
+        i_arr = np.empty(m, dtype=np.int64)
+        j_arr = np.empty(m, dtype=np.int64)
+        w_arr = np.empty(m, dtype=np.float64)
+        for i in prange(n):
+            pos = offsets[i]
+            for j in range(i + 1, n):
+                dx = pts[i, 0] - pts[j, 0]
+                dy = pts[i, 1] - pts[j, 1]
+                w = np.sqrt(dx * dx + dy * dy)
+                if i == 0 or w <= max(d_root[i], d_root[j]):
+                    i_arr[pos] = i
+                    j_arr[pos] = j
+                    w_arr[pos] = w
+                    pos += 1
+        return i_arr, j_arr, w_arr
+
+def _build_edges(pts, d_root):
+    """
+    Build the pruned edge list over pts (row 0 = root) as (i, j, w) arrays.
+
+    Edges to the root are always kept; other edges are kept only if no longer than
+    the larger distance of their endpoints to the root (d_root). Uses numba when available.
+    """
+    if njit is not None:
+        return _build_edges_numba(pts, d_root)
+
+    # Distances over upper-triangular pairs only, pruned in the same vectorized pass
+    i_arr, j_arr = np.triu_indices(pts.shape[0], k=1)
+    w_arr = np.linalg.norm(pts[i_arr] - pts[j_arr], axis=1)
+    keep = (i_arr == 0) | (w_arr <= np.maximum(d_root[i_arr], d_root[j_arr]))
+    return i_arr[keep], j_arr[keep], w_arr[keep]
+
+def _build_knn_edges(pts, d_root, num_neighbors):
+    """
+    Build the pruned edge list over pts (row 0 = root) from a k-nearest-neighbour graph.
+
+    Only pairs where one node is among the other's num_neighbors nearest neighbours are
+    candidates, plus every edge to the root; the root-distance pruning of _build_edges
+    is then applied. Edges to the root keep the graph connected for any num_neighbors.
+    """
+    num_pts = pts.shape[0]
+
+    # Query includes each point itself, so ask for one extra neighbour
+    dists, idx = cKDTree(pts).query(pts, k=min(num_neighbors + 1, num_pts))
+    rows = np.repeat(np.arange(num_pts), dists.shape[1] if dists.ndim > 1 else 1)
+    cols = idx.ravel()
+    w = dists.ravel()
+    not_self = rows != cols
+    i_arr = np.concatenate([np.minimum(rows, cols)[not_self], np.zeros(num_pts - 1, dtype=np.int64)])
+    j_arr = np.concatenate([np.maximum(rows, cols)[not_self], np.arange(1, num_pts)])
+    w_arr = np.concatenate([w[not_self], d_root[1:]])
+
+    # Deduplicate undirected pairs; sorting by i * num_pts + j keeps row-major order
+    _, first = np.unique(i_arr * num_pts + j_arr, return_index=True)
+    i_arr, j_arr, w_arr = i_arr[first], j_arr[first], w_arr[first]
+
+    keep = (i_arr == 0) | (w_arr <= np.maximum(d_root[i_arr], d_root[j_arr]))
+    return i_arr[keep], j_arr[keep], w_arr[keep]
+
+def _greedy_kmst_start(num_pts, i_arr, j_arr, w_arr, k):
+    """
+    Prim-style k-MST heuristic: grow a tree from the root (index 0) over the pruned
+    edges, always adding the cheapest edge to the frontier, until it spans k nodes.
 
-def _euclid(a, b):
-    return float(np.hypot(*(a - b)))
+    Returns:
+        tree_nodes (list): Indices of the nodes in the tree (including the root).
+        tree_edges (list): Positions of the chosen edges in (i_arr, j_arr, w_arr).
+    """
+    # Symmetric adjacency in CSR layout: neighbours of v are nbrs[indptr[v]:indptr[v + 1]]
+    num_edges = len(w_arr)
+    heads = np.concatenate([i_arr, j_arr])
+    order = np.argsort(heads, kind="stable")
+    nbrs = np.concatenate([j_arr, i_arr])[order].tolist()
+    edge_ids = np.tile(np.arange(num_edges), 2)[order].tolist()
+    weights = w_arr.tolist()
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(heads, minlength=num_pts))]).tolist()
+
+    in_tree = [False] * num_pts
+    tree_nodes = []
+    tree_edges = []
+    frontier = []
+
+    def add(node):
+        in_tree[node] = True
+        tree_nodes.append(node)
+        for pos in range(indptr[node], indptr[node + 1]):
+            if not in_tree[nbrs[pos]]:
+                heapq.heappush(frontier, (weights[edge_ids[pos]], edge_ids[pos], nbrs[pos]))
+
+    add(0)
+    while len(tree_nodes) < k and frontier:
+        _, edge_id, node = heapq.heappop(frontier)
+        if not in_tree[node]:
+            tree_edges.append(edge_id)
+            add(node)
+
+    return tree_nodes, tree_edges
+
+def _subtour_callback(model, where):
+    """
+    Gurobi callback adding lazy subtour-elimination cuts on each new incumbent.
+
+    Selected edges are grouped into components with union-find; for every component S
+    not containing the root, adds sum(x_e for e in delta(S)) >= y_v for each v in S.
+    """
+    if where != gp.GRB.Callback.MIPSOL:
+        return
+
+    edge_values = model.cbGetSolution(model._edge_mvar)
+    node_values = model.cbGetSolution(model._node_mvar)
+
+    # Union-find over the selected edges
+    parent = {node: node for node in np.flatnonzero(node_values > 0.5).tolist()}
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    selected = np.flatnonzero(edge_values > 0.5)
+    for node1, node2 in zip(model._i_arr[selected].tolist(), model._j_arr[selected].tolist()):
+        parent[find(node1)] = find(node2)
+
+    components = {}
+    for node in parent:
+        components.setdefault(find(node), set()).add(node)
+
+    root_component = find(0)
+    for representative, component in components.items():
+        if representative == root_component:
+            continue
+        # Edges with exactly one endpoint in the component form delta(S)
+        endpoint_counts = np.asarray(model._incidence[list(component)].sum(axis=0)).ravel()
+        cut = gp.quicksum(model._edge_list[e] for e in np.flatnonzero(endpoint_counts == 1).tolist())
+        for node in component:
+            model.cbLazy(cut >= model._node_list[node])
+
+def _check_num_nodes(num_nodes):
+    """Print why num_nodes candidate nodes cannot be modelled; returns True if they can."""
+    if num_nodes == 0:
+        print("No candidate nodes provided.")
+        return False
+    if num_nodes > 1500:
+        print("Current version of model only supports up to 1500 nodes. Please use smaller node number for this model.")
+        return False
+    return True
+
+def precompute_edges(coords, c_coords, num_neighbors=None):
+    """
+    Stack the node coordinates and build the pruned candidate edge list.
+
+    The result depends only on the node locations, not on k, so for a sweep over
+    several k values compute it once and pass it to milp_kmst_from_edges each time.
+
+    Args:
+        coords (list or np.ndarray): Coordinates of candidate nodes (excluding the root).
+        c_coords (tuple or np.ndarray): Coordinates of the root node.
+        num_neighbors (int, optional): If given, only consider edges between each node and
+            its num_neighbors nearest neighbours (plus all edges to the root). Around 20-30
+            shrinks the model drastically for large node sets; None considers all pairs.
+
+    Returns:
+        pts (np.ndarray): (num_nodes + 1, 2) coordinates; row 0 = root, row i + 1 = candidate i.
+        edge_arrays (tuple): (i_arr, j_arr, w_arr) edge endpoints as row indices into pts, and lengths.
+            Each undirected edge appears once, keyed by (i, j) with i < j (so the root is always
+            first), in row-major order; no deduplication is needed downstream.
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    pts = np.empty((len(coords) + 1, 2))
+    pts[0] = c_coords
+    pts[1:] = coords
+
+    # Distances to root, computed once for pruning
+    d_root = np.linalg.norm(pts - pts[0], axis=1)
+
+    # Build pruned edge list: always keep edges to root, otherwise prune by max distance to root
+    if num_neighbors is None:
+        edge_arrays = _build_edges(pts, d_root)
+    else:
+        edge_arrays = _build_knn_edges(pts, d_root, num_neighbors)
+    return pts, edge_arrays
 
-def milp_kmst(coords, c_coords, k, mip_gap, time_limit):
+def milp_kmst(coords, c_coords, k, mip_gap, time_limit, num_neighbors=None, verbose=False):
     """
-    Solve the k-MST problem with pruned edges and directed flows using Gurobi.
+    Solve the k-MST problem with pruned edges and lazy subtour elimination using Gurobi.
 
     Args:
         coords (list or np.ndarray): Coordinates of candidate nodes (excluding the root).
@@ -17,125 +230,136 @@ def milp_kmst(coords, c_coords, k, mip_gap, time_limit):
         k (int): Number of nodes to connect (including the root).
         mip_gap (float): MIP gap for Gurobi solver.
         time_limit (float): Time limit for Gurobi solver.
+        num_neighbors (int, optional): See precompute_edges.
+        verbose (bool, optional): Print the Gurobi solver log.
 
     Returns:
         selected_nodes (list): List of selected node labels (including root).
         selected_edges (list): List of selected edges as (node1, node2, weight).
     """
-    num_nodes = len(coords)
+    # Reject unsupported sizes before the O(n^2) edge construction
+    if not _check_num_nodes(len(coords)):
+        return [], []
+
+    pts, edge_arrays = precompute_edges(coords, c_coords, num_neighbors)
+    return milp_kmst_from_edges(pts, edge_arrays, k, mip_gap, time_limit, verbose)
+
+def milp_kmst_from_edges(pts, edge_arrays, k, mip_gap, time_limit, verbose=False):
+    """
+    Solve the k-MST problem over a candidate edge list from precompute_edges.
+
+    Args:
+        pts (np.ndarray): Node coordinates from precompute_edges (row 0 = root).
+        edge_arrays (tuple): (i_arr, j_arr, w_arr) edge arrays from precompute_edges
+            for the same pts.
+        k (int): Number of nodes to connect (including the root).
+        mip_gap (float): MIP gap for Gurobi solver.
+        time_limit (float): Time limit for Gurobi solver.
+        verbose (bool, optional): Print the Gurobi solver log.
+
+    Returns:
+        selected_nodes (list): List of selected node labels (including root).
+        selected_edges (list): List of selected edges as (node1, node2, weight).
+
+    Raises:
+        ValueError: If edge_arrays was not built from pts.
+    """
+    num_nodes = pts.shape[0] - 1
 
-    if num_nodes == 0 or num_nodes > 1500:
-        if num_nodes == 0:
-            print("No candidate nodes provided.")
-        else:
-            print("Current version of model only supports up to 1500 nodes. Please use smaller node number for this model.")
+    if not _check_num_nodes(num_nodes):
         return [], []
 
+    # Every candidate has exactly one edge to the root, and no index may exceed pts
+    i_arr, j_arr, w_arr = edge_arrays
+    if np.count_nonzero(i_arr == 0) != num_nodes or (len(j_arr) and j_arr.max() > num_nodes):
+        raise ValueError("edge_arrays does not match pts; rebuild both with precompute_edges.")
+
     # Ensure k is feasible
     if k > num_nodes:
         print(f"This is not feasible, design for total {num_nodes} nodes instead of {k}")
         k = num_nodes
 
-    # Use string for root node for clarity, rest are integers
-    root = "C"
-    nodes = [root] + list(range(num_nodes))
-    node_positions = {root: np.array(c_coords), **{i: np.array(coords[i]) for i in range(num_nodes)}}
-
-    # Precompute distances to root for pruning
-    distances_to_root = {node: _euclid(node_positions[node], node_positions[root]) for node in nodes}
-
-    # Build pruned edge list: always keep edges to root, otherwise prune by max distance to root
-    edges = []
-    for i, node1 in enumerate(nodes):
-        for node2 in nodes[i + 1:]:
-            edge_weight = _euclid(node_positions[node1], node_positions[node2])
-            if node1 == root or node2 == root or edge_weight <= max(distances_to_root[node1], distances_to_root[node2]):
-                edges.append((node1, node2, edge_weight))
+    # Internally every node is a row index into pts, with row 0 = root. The external
+    # labels ("C" for the root, 0..num_nodes-1 for candidates) are only used for
+    # the returned solution.
+    labels = ["C"] + list(range(num_nodes))
+    num_pts = num_nodes + 1
 
     # ---------------- Model setup ------------------------------------
-    model = gp.Model("kMST_directed")
-    model.Params.OutputFlag = 1
+    model = gp.Model("kMST")
+    model.Params.OutputFlag = int(verbose)
     model.Params.MIPGap = mip_gap
     model.Params.TimeLimit = time_limit
-    model.Params.VarBranch = 2  # Strong branching (slower but stronger bound tightening)
+    model.Params.LazyConstraints = 1  # Connectivity is enforced by lazy subtour cuts
+    model.Params.Threads = min(max((os.cpu_count() or 2) // 2, 1), 16)  # Physical cores, not hyperthreads
+    model.Params.Presolve = 2  # Aggressive presolve
 
     # Use gp.GRB for Gurobi constants
     GRB = gp.GRB
 
     # ---------------- Decision variables -----------------------------
-    # Directed arc variables and flows
-    arc_variables = {}
-    flow_variables = {}
-    for (node1, node2, _) in edges:
-        arc_variables[(node1, node2)] = model.addVar(vtype=GRB.BINARY, name=f"arc_{node1}_{node2}")
-        arc_variables[(node2, node1)] = model.addVar(vtype=GRB.BINARY, name=f"arc_{node2}_{node1}")
-        flow_variables[(node1, node2)] = model.addVar(lb=0, ub=k - 1, name=f"flow_{node1}_{node2}")
-        flow_variables[(node2, node1)] = model.addVar(lb=0, ub=k - 1, name=f"flow_{node2}_{node1}")
-        
-        # At most one orientation per edge
-        model.addConstr(arc_variables[(node1, node2)] + arc_variables[(node2, node1)] <= 1, name=f"one_dir_{node1}_{node2}")
-        # Flow capacity constraints
-        model.addConstr(flow_variables[(node1, node2)] <= (k - 1) * arc_variables[(node1, node2)], name=f"flow_cap_{node1}_{node2}")
-        model.addConstr(flow_variables[(node2, node1)] <= (k - 1) * arc_variables[(node2, node1)], name=f"flow_cap_{node2}_{node1}")
-
-    node_variables = model.addVars(nodes, vtype=GRB.BINARY, name="node")
-    model.addConstr(node_variables["C"] == 1, name="root_selected")
+    # One binary per undirected edge (in edge-list order), one per node (in row-index order)
+    num_edges = len(w_arr)
+    edge_mvar = model.addMVar(num_edges, vtype=GRB.BINARY, name="edge")
+    node_mvar = model.addMVar(num_pts, vtype=GRB.BINARY, name="node")
+    model.addConstr(node_mvar[0] == 1, name="root_selected")
 
     # ---------------- Objective --------------------------------------
-    model.setObjective(gp.quicksum(weight * (arc_variables[(node1, node2)] + arc_variables[(node2, node1)]) 
-                                  for (node1, node2, weight) in edges), GRB.MINIMIZE)
+    model.setObjective(w_arr @ edge_mvar, GRB.MINIMIZE)
 
     # ---------------- Constraints ------------------------------------
     # Select k-1 nodes (excluding root) and k-1 edges
-    model.addConstr(gp.quicksum(node_variables[i] for i in range(num_nodes)) == k - 1, name="k_nodes")
-    model.addConstr(gp.quicksum(arc_variables.values()) == k - 1, name="k_edges")
-
-    # Edge can only be selected if both endpoints are selected
-    for (node1, node2, _) in edges:
-        for arc in [(node1, node2), (node2, node1)]:
-            model.addConstr(arc_variables[arc] <= node_variables[node1], name=f"arc_node1_{arc[0]}_{arc[1]}")
-            model.addConstr(arc_variables[arc] <= node_variables[node2], name=f"arc_node2_{arc[0]}_{arc[1]}")
-
-    # ---------------- Flow conservation ------------------------------
-    # Flow conservation at root: net outflow = k-1
-    model.addConstr(
-        gp.quicksum(flow_variables[("C", n)] for n in nodes if n != "C" and ("C", n) in flow_variables) -
-        gp.quicksum(flow_variables[(n, "C")] for n in nodes if n != "C" and (n, "C") in flow_variables)
-        == k - 1, name="root_flow"
-    )
-
-    # Flow conservation at other nodes: net flow = node selection
-    for node2 in range(num_nodes):
-        inflow = gp.quicksum(flow_variables[(node1, node2)] for node1 in nodes
-                             if node1 != node2 and (node1, node2) in flow_variables)
-        outflow = gp.quicksum(flow_variables[(node2, node1)] for node1 in nodes
-                              if node1 != node2 and (node2, node1) in flow_variables)
-        model.addConstr(inflow - outflow == node_variables[node2], name=f"flow_cons_{node2}")
+    model.addConstr(node_mvar[1:].sum() == k - 1, name="k_nodes")
+    model.addConstr(edge_mvar.sum() == k - 1, name="k_edges")
+
+    # Edge can only be selected if both endpoints are selected: one sparse row per (edge, endpoint)
+    edge_rows = np.arange(num_edges)
+    endpoint1 = sp.csr_matrix((np.ones(num_edges), (edge_rows, i_arr)), shape=(num_edges, num_pts))
+    endpoint2 = sp.csr_matrix((np.ones(num_edges), (edge_rows, j_arr)), shape=(num_edges, num_pts))
+    model.addConstr(edge_mvar <= endpoint1 @ node_mvar, name="edge_node1")
+    model.addConstr(edge_mvar <= endpoint2 @ node_mvar, name="edge_node2")
+
+    # ---------------- Subtour elimination (lazy) ---------------------
+    # Sparse node-edge incidence matrix, used by the callback to build cut sets delta(S)
+    incidence = sp.csr_matrix((np.ones(2 * num_edges), (np.concatenate([i_arr, j_arr]), np.tile(edge_rows, 2))),
+                              shape=(num_pts, num_edges))
+
+    model._edge_mvar = edge_mvar
+    model._node_mvar = node_mvar
+    model._edge_list = edge_mvar.tolist()
+    model._node_list = node_mvar.tolist()
+    model._i_arr = i_arr
+    model._j_arr = j_arr
+    model._incidence = incidence
 
     # ---------------- Branch priorities (optional) -------------------
-    for arc in arc_variables:
-        if "C" in arc:
-            arc_variables[arc].BranchPriority = 10  # Higher priority for arcs from/to root
-        else:
-            arc_variables[arc].BranchPriority = 0   # Default for others
+    # Higher priority for edges to root, default for others
+    edge_mvar.BranchPriority = np.where(i_arr == 0, 10, 0)
+
+    # ---------------- Warm start -------------------------------------
+    # Greedy tree from the root gives Gurobi an immediate incumbent
+    start_nodes, start_edges = _greedy_kmst_start(num_pts, i_arr, j_arr, w_arr, k)
+    node_start = np.zeros(num_pts)
+    node_start[start_nodes] = 1.0
+    edge_start = np.zeros(num_edges)
+    edge_start[start_edges] = 1.0
+    node_mvar.Start = node_start
+    edge_mvar.Start = edge_start
 
     # ---------------- Solve & extract ------------------------
-    model.optimize()
+    model.optimize(_subtour_callback)
 
     if model.SolCount == 0:
         return ["C"], []  # No feasible solution
 
-    # Use list comprehension for clarity and efficiency
-    selected_nodes = ["C"] + [i for i in range(num_nodes) if node_variables[i].X > 0.5]
-    selected_edges = []
-    seen_edges = set()
-    
-    for (node1, node2, weight) in edges:
-        if arc_variables[(node1, node2)].X > 0.5 or arc_variables[(node2, node1)].X > 0.5:
-            edge_key = tuple(sorted((node1, node2), key=str))
-            if edge_key not in seen_edges:
-                selected_edges.append((node1, node2, weight))
-                seen_edges.add(edge_key)
+    # Read all solution values in one call per variable block
+    node_x = node_mvar.X
+    edge_x = edge_mvar.X
+    selected_nodes = ["C"] + [labels[i] for i in np.flatnonzero(node_x[1:] > 0.5) + 1]
+    # Each undirected edge appears once in the edge arrays, so no deduplication is needed
+    selected = np.flatnonzero(edge_x > 0.5)
+    selected_edges = [(labels[node1], labels[node2], weight) for node1, node2, weight
+                      in zip(i_arr[selected].tolist(), j_arr[selected].tolist(), w_arr[selected].tolist())]
 
     return selected_nodes, selected_edges
 
@@ -144,53 +368,35 @@ def save_kmst_results(selected_nodes, selected_edges, coords, c_coords, k, outpu
     # Create output folder if it doesn't exist
     os.makedirs(output_folder, exist_ok=True)
 
+    # Stack candidate and root coordinates; the root ('C') is the last row
+    coords = np.asarray(coords, dtype=float)
+    num_nodes = len(coords)
+    pts = np.vstack([coords, np.asarray(c_coords, dtype=float).reshape(1, 2)])
+
     # Save all nodes (selected and unselected) as GeoJSON
-    nodes_features = []
-    selected_set = set(int(n) for n in selected_nodes if n != 'C')
-    for i in range(len(coords)):
-        geom = Point(coords[i][0], coords[i][1])
-        props = {"node_id": i, "selected": i in selected_set}
-        nodes_features.append({"geometry": geom, "properties": props})
-    # Add node 'C'
-    nodes_features.append({
-        "geometry": Point(c_coords[0], c_coords[1]),
-        "properties": {"node_id": "C", "selected": True}
-    })
-
-    # Create GeoDataFrame for nodes and save
+    selected_flags = np.zeros(num_nodes + 1, dtype=bool)
+    selected_flags[[int(n) for n in selected_nodes if n != 'C']] = True
+    selected_flags[-1] = True
     nodes_gdf = gpd.GeoDataFrame(
-        [f["properties"] for f in nodes_features],
-        geometry=[f["geometry"] for f in nodes_features]
+        {"node_id": list(range(num_nodes)) + ["C"], "selected": selected_flags},
+        geometry=gpd.points_from_xy(pts[:, 0], pts[:, 1])
     )
-    nodes_gdf.to_file(os.path.join(output_folder, 'nodes.geojson'), driver='GeoJSON')
+    nodes_gdf.to_file(os.path.join(output_folder, 'nodes.geojson'), driver='GeoJSON', engine='pyogrio')
 
     # Create edges GeoDataFrame and save
-    edges_features = []
-    for edge in selected_edges:
-        node1, node2, weight = edge
-        # Handle if node1 or node2 is 'C'
-        if node1 == 'C':
-            p1 = c_coords
-        else:
-            p1 = coords[int(node1)]
-        if node2 == 'C':
-            p2 = c_coords
-        else:
-            p2 = coords[int(node2)]
-        line_geom = LineString([[p1[0], p1[1]], [p2[0], p2[1]]])
-        props = {"node1": node1, "node2": node2, "weight": weight}
-        edges_features.append({"geometry": line_geom, "properties": props})
-
+    node1s = [edge[0] for edge in selected_edges]
+    node2s = [edge[1] for edge in selected_edges]
+    rows1 = [num_nodes if n == 'C' else int(n) for n in node1s]
+    rows2 = [num_nodes if n == 'C' else int(n) for n in node2s]
     edges_gdf = gpd.GeoDataFrame(
-        [f["properties"] for f in edges_features],
-        geometry=[f["geometry"] for f in edges_features]
+        {"node1": node1s, "node2": node2s, "weight": [edge[2] for edge in selected_edges]},
+        geometry=shapely.linestrings(np.stack([pts[rows1], pts[rows2]], axis=1))
     )
-    edges_gdf.to_file(os.path.join(output_folder, 'edges.geojson'), driver='GeoJSON')
+    edges_gdf.to_file(os.path.join(output_folder, 'edges.geojson'), driver='GeoJSON', engine='pyogrio')
 
     # Save summary
     summary = f"k: {k}\nnodes_selected: {len(selected_nodes)}\nedges_selected: {len(selected_edges)}\ntotal_weight: {sum(edge[2] for edge in selected_edges)}\nc_coords: {c_coords}"
-    with open(os.path.join(output_folder, 'summary.txt'), 'w') as f:
-        f.write(summary)
+    Path(output_folder, 'summary.txt').write_text(summary)
 
     print(f"Results saved to {output_folder}/: nodes.geojson, edges.geojson, summary.txt")
 
@@ -235,7 +441,7 @@ if __name__ == "__main__":
     time_limit = 300    # time limit for the Gurobi solver (seconds)
 
     # Run the model
-    nodes, edges = milp_kmst(coords, c_coords, k, mip_gap, time_limit)
+    nodes, edges = milp_kmst(coords, c_coords, k, mip_gap, time_limit, verbose=True)
 
     print(nodes, edges)
     